@@ -26,5 +26,10 @@ setup(
     python_requires=">=3.5",
     install_requires=[
         "requests>=2.25.0",
+        "urllib3>=1.26.0",
+        "orjson>=3.0.0",
     ],
+    extras_require={
+        "async": ["httpx[http2]>=0.23.0"],
+    },
 )
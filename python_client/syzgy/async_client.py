@@ -0,0 +1,135 @@
+import asyncio
+import httpx
+import orjson
+from typing import List, Dict, Optional
+from .exceptions import SyzgyException
+from .models import Document, SearchResult
+
+class AsyncSyzgyClient:
+    def __init__(self, base_url: str, binary_vectors: bool = False):
+        self.base_url = base_url.rstrip('/')
+        self.binary_vectors = binary_vectors
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=30.0,
+        )
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _request(self, method: str, endpoint: str, parse_json: bool = True, **kwargs) -> Optional[Dict]:
+        response = await self._client.request(method, endpoint, **kwargs)
+        if response.status_code >= 400:
+            error_message = f"HTTP {response.status_code}: {response.reason_phrase}"
+            try:
+                error_body = response.json()
+                error_message += f"\nResponse body: {error_body}"
+            except ValueError:
+                error_message += f"\nResponse body: {response.text}"
+            raise SyzgyException(error_message)
+        if not parse_json:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            raise SyzgyException(f"Invalid JSON response: {response.text}")
+
+    async def create_collection(self, name: str, vector_size: int, quantization: int, distance_function: str) -> "AsyncCollection":
+        data = {
+            "name": name,
+            "vector_size": vector_size,
+            "quantization": quantization,
+            "distance_function": distance_function
+        }
+        await self._request("POST", "/api/v1/collections", parse_json=False, json=data)
+        return AsyncCollection(self, name, 0, vector_size, quantization, distance_function)
+
+    async def get_collections(self) -> List["AsyncCollection"]:
+        result = await self._request("GET", "/api/v1/collections")
+        return [AsyncCollection(self, c["name"], c["document_count"], c["dimension_count"], c["quantization"], c["distance_method"]) for c in result]
+
+    async def get_collection(self, name: str) -> "AsyncCollection":
+        result = await self._request("GET", f"/api/v1/collections/{name}")
+        return AsyncCollection(self, name, result["document_count"], result["dimension_count"], result["quantization"], result["distance_method"])
+
+    async def delete_collection(self, collection_name: str) -> None:
+        await self._request("DELETE", f"/api/v1/collections/{collection_name}", parse_json=False)
+
+class AsyncCollection:
+    def __init__(self, client: AsyncSyzgyClient, collection_name: str, document_count: int, dimension_count: int, quantization: int, distance_function: str):
+        self.client = client
+        self.collection_name = collection_name
+        self.document_count = document_count
+        self.dimension_count = dimension_count
+        self.quantization = quantization
+        self.distance_function = distance_function
+        self._path = f"/api/v1/collections/{collection_name}"
+
+    async def insert_documents(self, documents: List[Document]) -> Dict:
+        data = orjson.dumps([doc.to_dict(self.client.binary_vectors) for doc in documents],
+                            option=orjson.OPT_NON_STR_KEYS)
+        return await self.client._request("POST", self._path + "/records", content=data, headers={"Content-Type": "application/json"})
+
+    async def update_document_metadata(self, document_id: int, metadata: Dict) -> None:
+        data = {"metadata": metadata}
+        await self.client._request("PUT", f"{self._path}/records/{document_id}/metadata", parse_json=False, json=data)
+
+    async def delete_document(self, document_id: int) -> None:
+        await self.client._request("DELETE", f"{self._path}/records/{document_id}", parse_json=False)
+
+    async def search(self, vector: Optional[List[float]] = None, text: Optional[str] = None,
+                     k: Optional[int] = None, radius: Optional[float] = None, limit: Optional[int] = None,
+                     offset: Optional[int] = None, precision: Optional[str] = None,
+                     filter: Optional[str] = None) -> List[SearchResult]:
+        data = {}
+        if vector is not None:
+            data["vector"] = vector
+        if text is not None:
+            data["text"] = text
+        if k is not None:
+            data["k"] = k
+        if radius is not None:
+            data["radius"] = radius
+        if limit is not None:
+            data["limit"] = limit
+        if offset is not None:
+            data["offset"] = offset
+        if precision is not None:
+            data["precision"] = precision
+        if filter is not None:
+            data["filter"] = filter
+        result = await self.client._request("POST", self._path + "/search", json=data)
+        return [SearchResult(**item) for item in result["results"]]
+
+    async def get_document_ids(self) -> List[int]:
+        return await self.client._request("GET", self._path + "/ids")
+
+async def bulk_insert(collection: AsyncCollection, documents: List[Document], batch_size: int = 32, concurrency: int = 8) -> List[Dict]:
+    """Insert documents in batches of batch_size, keeping at most
+    concurrency requests in flight at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def insert_batch(batch):
+        async with semaphore:
+            return await collection.insert_documents(batch)
+
+    batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+    tasks = [asyncio.ensure_future(insert_batch(batch)) for batch in batches]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        # gather leaves the other batches running when one fails; cancel
+        # them so nothing is still using the client once the caller sees
+        # the error (and typically closes it).
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
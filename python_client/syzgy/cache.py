@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# A small LRU cache of parsed GET responses keyed by URL. Entries are fresh
+# for ttl seconds; after that they are kept along with the server's ETag so
+# the client can revalidate with If-None-Match instead of refetching.
+# A client may be shared between threads, so every access holds _lock.
+class ResponseCache:
+    def __init__(self, maxsize: int = 128, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Tuple[bool, Optional[str], Any]]:
+        # Returns (fresh, etag, body), or None if the URL is not cached.
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+        expires, etag, body = entry
+        return expires > time.monotonic(), etag, body
+
+    def put(self, url: str, body: Any, etag: Optional[str] = None):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[url] = (time.monotonic() + self.ttl, etag, body)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, url: str):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def invalidate(self, url: str):
+        # Drop the URL and everything below it, e.g. a collection and its ids.
+        prefix = url + "/"
+        with self._lock:
+            for key in [k for k in self._entries if k == url or k.startswith(prefix)]:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
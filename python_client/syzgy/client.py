@@ -0,0 +1,208 @@
+import copy
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Union, Optional
+from .cache import ResponseCache
+from .exceptions import SyzgyException
+from .models import Document, SearchResult
+
+def _iter_json_array(items):
+    # Encode items as a JSON array one element at a time, so a large batch
+    # can be sent as it is encoded instead of being built in memory.
+    yield b"["
+    first = True
+    for item in items:
+        encoded = orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS)
+        yield encoded if first else b"," + encoded
+        first = False
+    yield b"]"
+
+class SyzgyClient:
+    def __init__(self, base_url: str, *, cache_ttl: float = 5.0, binary_vectors: bool = False,
+                 stream_threshold: int = 1000, pool_size: int = 64, pool_block: bool = False,
+                 retries: int = 3, backoff: float = 0.2, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self._collections_url = self.base_url + "/api/v1/collections"
+        self.timeout = timeout
+        # Inserts of more documents than this are uploaded with a chunked body.
+        self.stream_threshold = stream_threshold
+        # Send vectors as base64-packed binary instead of JSON float lists.
+        # The server must understand the "vector_b64" field.
+        self.binary_vectors = binary_vectors
+        # Parsed GET responses. A ttl of 0 disables caching.
+        self.cache = ResponseCache(maxsize=128, ttl=cache_ttl)
+        # A single session keeps connections alive across calls instead of
+        # paying for a new TCP (and TLS) handshake on every request.
+        # raise_on_status=False hands the last response back once retries run
+        # out, so it reaches the SyzgyException handling in _request_url.
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=("GET", "POST", "PUT", "DELETE"), raise_on_status=False)
+        self._session = self._new_session(retry, pool_size, pool_block)
+        # Streamed bodies are generators that can't be replayed, so uploads
+        # on this session only retry connections that failed before anything
+        # was sent.
+        stream_retry = Retry(total=retries, connect=retries, read=0, status=0, other=0,
+                             backoff_factor=backoff, raise_on_status=False)
+        self._stream_session = self._new_session(stream_retry, pool_size, pool_block)
+
+    @staticmethod
+    def _new_session(retry: Retry, pool_size: int, pool_block: bool) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+        # Size the pool for concurrent callers; the requests default of 10
+        # connections would queue anything beyond that.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block,
+                              max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        self._session.close()
+        self._stream_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request_url(self, method: str, url: str, parse_json: bool = True, streamed: bool = False,
+                     **kwargs) -> Optional[Dict]:
+        cached = None
+        if method == "GET" and parse_json:
+            cached = self.cache.get(url)
+            if cached is not None:
+                fresh, etag, body = cached
+                # Hand out shallow copies so callers that modify a result
+                # (e.g. the list of ids) don't change the cached body.
+                if fresh:
+                    return copy.copy(body)
+                if etag is not None:
+                    kwargs.setdefault("headers", {})["If-None-Match"] = etag
+        kwargs.setdefault("timeout", self.timeout)
+        session = self._stream_session if streamed else self._session
+        response = session.request(method, url, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.cache.put(url, cached[2], cached[1])
+            return copy.copy(cached[2])
+        if response.status_code >= 400:
+            error_message = f"HTTP {response.status_code}: {response.reason}"
+            try:
+                error_body = response.json()
+                error_message += f"\nResponse body: {error_body}"
+            except ValueError:
+                error_message += f"\nResponse body: {response.text}"
+            raise SyzgyException(error_message)
+        if not parse_json:
+            return None
+        try:
+            body = response.json()
+        except ValueError:
+            raise SyzgyException(f"Invalid JSON response: {response.text}")
+        if method == "GET":
+            self.cache.put(url, body, response.headers.get("ETag"))
+            return copy.copy(body)
+        return body
+
+    def create_collection(self, name: str, vector_size: int, quantization: int, distance_function: str) -> "Collection":
+        data = {
+            "name": name,
+            "vector_size": vector_size,
+            "quantization": quantization,
+            "distance_function": distance_function
+        }
+        self._request_url("POST", self._collections_url, parse_json=False, json=data)
+        self.invalidate_collection(name)
+        # Use the parameters passed in to construct the Collection object
+        return Collection(self, name, 0, vector_size, quantization, distance_function)
+
+    def get_collections(self) -> List["Collection"]:
+        result = self._request_url("GET", self._collections_url)
+        for c in result:
+            self.cache.put(f"{self._collections_url}/{c['name']}", c)
+        return [Collection(self, c["name"], c["document_count"], c["dimension_count"], c["quantization"], c["distance_method"]) for c in result]
+
+    def get_collection(self, name: str) -> "Collection":
+        result = self._request_url("GET", f"{self._collections_url}/{name}")
+        return Collection(self, name, result["document_count"], result["dimension_count"], result["quantization"], result["distance_method"])
+
+    def delete_collection(self, collection_name: str) -> None:
+        self._request_url("DELETE", f"{self._collections_url}/{collection_name}", parse_json=False)
+        self.invalidate_collection(collection_name)
+
+    def invalidate_collection(self, name: Optional[str] = None):
+        # Forget cached responses for the collection (its info and ids) and
+        # the collection list, or everything if no name is given.
+        if name is None:
+            self.cache.clear()
+        else:
+            self._invalidate_url(f"{self._collections_url}/{name}")
+
+    def _invalidate_url(self, collection_url: str):
+        self.cache.invalidate(collection_url)
+        self.cache.discard(self._collections_url)
+
+class Collection:
+    def __init__(self, client: SyzgyClient, collection_name: str, document_count: int, dimension_count: int, quantization: int, distance_function: str):
+        self.client = client
+        self.collection_name = collection_name
+        self.document_count = document_count
+        self.dimension_count = dimension_count
+        self.quantization = quantization
+        self.distance_function = distance_function
+        # Every request below is for a URL under this one; build it once.
+        self._url = f"{client._collections_url}/{collection_name}"
+
+    def insert_documents(self, documents: List[Document]) -> Dict:
+        binary = self.client.binary_vectors
+        streamed = len(documents) > self.client.stream_threshold
+        if streamed:
+            data = _iter_json_array(doc.to_dict(binary) for doc in documents)
+        else:
+            # OPT_NON_STR_KEYS turns non-string metadata keys into strings,
+            # as the stdlib encoder does, instead of raising TypeError.
+            data = orjson.dumps([doc.to_dict(binary) for doc in documents], option=orjson.OPT_NON_STR_KEYS)
+        # Invalidate only once the write has landed; clearing first would let
+        # a concurrent GET re-cache the old state for a full TTL.
+        result = self.client._request_url("POST", self._url + "/records", streamed=streamed, data=data)
+        self.client._invalidate_url(self._url)
+        return result
+
+    def update_document_metadata(self, document_id: int, metadata: Dict) -> None:
+        data = {"metadata": metadata}
+        self.client._request_url("PUT", f"{self._url}/records/{document_id}/metadata", parse_json=False, json=data)
+
+    def delete_document(self, document_id: int) -> None:
+        self.client._request_url("DELETE", f"{self._url}/records/{document_id}", parse_json=False)
+        self.client._invalidate_url(self._url)
+
+    def search(self, vector: Optional[List[float]] = None, text: Optional[str] = None,
+               k: Optional[int] = None, radius: Optional[float] = None, limit: Optional[int] = None,
+               offset: Optional[int] = None, precision: Optional[str] = None,
+               filter: Optional[str] = None) -> List[SearchResult]:
+        data = {}
+        if vector is not None:
+            data["vector"] = vector
+        if text is not None:
+            data["text"] = text
+        if k is not None:
+            data["k"] = k
+        if radius is not None:
+            data["radius"] = radius
+        if limit is not None:
+            data["limit"] = limit
+        if offset is not None:
+            data["offset"] = offset
+        if precision is not None:
+            data["precision"] = precision
+        if filter is not None:
+            data["filter"] = filter
+        result = self.client._request_url("POST", self._url + "/search", json=data)
+        return [SearchResult(**item) for item in result["results"]]
+
+    def get_document_ids(self) -> List[int]:
+        result = self.client._request_url("GET", self._url + "/ids")
+        return result
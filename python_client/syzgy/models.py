@@ -1,23 +1,63 @@
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+import array
+import base64
+import sys
+from typing import List, Dict, Optional, Tuple, Union, TYPE_CHECKING
+from dataclasses import dataclass
 
-@dataclass
-class Collection:
-    collection_name: str
-    document_count: int
-    dimension_count: int
-    quantization: int
-    distance_function: str
+if TYPE_CHECKING:
+    import numpy
+
+def _encode_vector(vector, dtype: str) -> Tuple[str, str]:
+    # Pack a vector as little-endian binary and base64 it. "int8" assumes
+    # components in [-1, 1] and scales them to [-127, 127].
+    if dtype not in ("float32", "int8"):
+        raise ValueError(f"Unsupported vector dtype: {dtype}")
+    if hasattr(vector, "astype"):
+        # numpy array: convert in C without importing numpy here.
+        if dtype == "int8":
+            data = (vector * 127).round().clip(-128, 127).astype("<i1").tobytes()
+        else:
+            data = vector.astype("<f4", copy=False).tobytes()
+    else:
+        if dtype == "int8":
+            values = array.array('b', [max(-128, min(127, round(x * 127))) for x in vector])
+        elif isinstance(vector, array.array) and vector.typecode == 'f' and sys.byteorder == "little":
+            values = vector
+        else:
+            values = array.array('f', vector)
+        if sys.byteorder == "big":
+            values.byteswap()
+        data = values.tobytes()
+    encoding = "i8b64" if dtype == "int8" else "f32b64"
+    return base64.b64encode(data).decode("ascii"), encoding
 
 @dataclass
 class Document:
     id: int
-    vector: Optional[List[float]] = None
+    # Vectors may be lists, numpy arrays or array.array('f') buffers. Arrays
+    # use a fraction of the memory of a list of floats and are converted
+    # only when the document is sent, so prefer building them once up front.
+    vector: Optional[Union[List[float], "numpy.ndarray", array.array]] = None
     text: Optional[str] = None
     metadata: Optional[Dict] = None
+    vector_dtype: str = "float32"
 
-    def to_dict(self):
-        return {k: v for k, v in asdict(self).items() if v is not None}
+    def to_dict(self, binary: bool = False):
+        # Built by hand rather than with asdict(), which deep-copies the
+        # vector and metadata of every document.
+        d = {"id": self.id}
+        if self.vector is not None:
+            if binary:
+                d["vector_b64"], d["vector_encoding"] = _encode_vector(self.vector, self.vector_dtype)
+            elif isinstance(self.vector, list):
+                d["vector"] = self.vector
+            else:
+                d["vector"] = self.vector.tolist()
+        if self.text is not None:
+            d["text"] = self.text
+        if self.metadata is not None:
+            d["metadata"] = self.metadata
+        return d
 
 @dataclass
 class SearchResult:
@@ -0,0 +1,70 @@
+import asyncio
+import math
+import unittest
+import orjson
+from syzgy import Document, SyzgyException
+
+try:
+    import httpx
+    from syzgy.async_client import AsyncSyzgyClient, AsyncCollection, bulk_insert
+except ImportError:
+    httpx = None
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestBulkInsert(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_batch = None
+
+    async def _handler(self, request):
+        # Stand-in for the server: records each batch and holds it briefly
+        # so concurrent requests overlap.
+        batch = orjson.loads(request.content)
+        self.requests.append(batch)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if self.fail_batch is not None and batch[0]["id"] == self.fail_batch:
+            return httpx.Response(503, json={"error": "busy"})
+        return httpx.Response(201, json={"message": "Records inserted successfully."})
+
+    def _run(self, documents, **kwargs):
+        async def main():
+            async with AsyncSyzgyClient("http://syzgy.test") as client:
+                client._client = httpx.AsyncClient(base_url=client.base_url,
+                                                   transport=httpx.MockTransport(self._handler))
+                collection = AsyncCollection(client, "test_collection", 0, 2, 8, "cosine")
+                try:
+                    return await bulk_insert(collection, documents, **kwargs)
+                finally:
+                    # Checked before the client closes and asyncio.run
+                    # cancels whatever bulk_insert left behind.
+                    self.in_flight_on_return = self.in_flight
+        return asyncio.run(main())
+
+    def test_batches_and_concurrency(self):
+        documents = [Document(id=i, vector=[0.1, 0.2]) for i in range(100)]
+        results = self._run(documents, batch_size=8, concurrency=3)
+
+        self.assertEqual(len(self.requests), math.ceil(100 / 8))
+        self.assertEqual(len(results), len(self.requests))
+        self.assertEqual(sorted(d["id"] for batch in self.requests for d in batch), list(range(100)))
+        self.assertLessEqual(self.max_in_flight, 3)
+        self.assertGreater(self.max_in_flight, 1)
+
+    def test_error_cancels_remaining_batches(self):
+        self.fail_batch = 0
+        documents = [Document(id=i, vector=[0.1, 0.2]) for i in range(100)]
+        with self.assertRaises(SyzgyException) as cm:
+            self._run(documents, batch_size=8, concurrency=2)
+        self.assertIn("503", str(cm.exception))
+        self.assertEqual(self.in_flight_on_return, 0)
+        self.assertLess(len(self.requests), math.ceil(100 / 8))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,29 +1,260 @@
+import array
+import base64
+import sys
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
-from syzgy import SyzgyClient, Collection, Document, SearchResult
+import orjson
+import requests
+from syzgy import SyzgyClient, Collection, Document, SearchResult, SyzgyException
+from syzgy.cache import ResponseCache
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    # Answers each request with the next (status, body) the test queued,
+    # or 200 {} once the queue is empty, and records every request body.
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+                if size == 0:
+                    break
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.bodies.append(body)
+        status, payload = self.server.responses.pop(0) if self.server.responses else (200, b"{}")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+class TestRetries(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedHandler)
+        self.server.responses = []
+        self.server.bodies = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = SyzgyClient(f"http://127.0.0.1:{self.server.server_port}", cache_ttl=0, retries=2, backoff=0)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_exhausted_retries_raise_syzgy_exception(self):
+        self.server.responses = [(503, b'{"error":"busy"}')] * 3
+        with self.assertRaises(SyzgyException) as cm:
+            self.client.get_collection("test_collection")
+        self.assertIn("503", str(cm.exception))
+        self.assertEqual(len(self.server.bodies), 3)
+
+    def test_single_shot_insert_is_retried(self):
+        self.server.responses = [(503, b'{"error":"busy"}')]
+        collection = Collection(self.client, "test_collection", 0, 2, 8, "cosine")
+        collection.insert_documents([Document(id=i, vector=[0.1, 0.2]) for i in range(3)])
+        self.assertEqual(len(self.server.bodies), 2)
+        self.assertEqual(self.server.bodies[0], self.server.bodies[1])
+        self.assertEqual(len(orjson.loads(self.server.bodies[1])), 3)
+
+    def test_streamed_insert_is_not_replayed(self):
+        # A retry would resend the already-consumed generator as an empty
+        # body; the caller should see the server's 503 instead.
+        self.server.responses = [(503, b'{"error":"busy"}')]
+        self.client.stream_threshold = 2
+        collection = Collection(self.client, "test_collection", 0, 2, 8, "cosine")
+        with self.assertRaises(SyzgyException) as cm:
+            collection.insert_documents([Document(id=i, vector=[0.1, 0.2]) for i in range(3)])
+        self.assertIn("503", str(cm.exception))
+        self.assertEqual(len(self.server.bodies), 1)
+        self.assertEqual(len(orjson.loads(self.server.bodies[0])), 3)
 
 class TestSyzgyClient(unittest.TestCase):
     def setUp(self):
         self.client = SyzgyClient("http://localhost:8080")
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_create_collection(self, mock_request):
         mock_response = MagicMock()
         mock_response.status_code = 201
+        mock_response.json.return_value = {
+            "message": "Collection created successfully.",
+            "collection_name": "test_collection"
+        }
+        mock_request.return_value = mock_response
+
+        collection = self.client.create_collection("test_collection", 128, 8, "cosine")
+        self.assertIsInstance(collection, Collection)
+        self.assertEqual(collection.collection_name, "test_collection")
+        self.assertEqual(collection.dimension_count, 128)
+
+    @patch('requests.Session.request')
+    def test_get_collection_is_cached(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
         mock_response.json.return_value = {
             "name": "test_collection",
             "document_count": 0,
-            "dimension_count": 128,
+            "dimension_count": 2,
             "quantization": 8,
-            "distance_function": "cosine"
+            "distance_method": "cosine"
         }
         mock_request.return_value = mock_response
 
-        collection = self.client.create_collection("test_collection", 128, 8, "cosine")
-        self.assertIsInstance(collection, Collection)
-        self.assertEqual(collection.name, "test_collection")
+        collection = self.client.get_collection("test_collection")
+        self.client.get_collection("test_collection")
+        self.assertEqual(mock_request.call_count, 1)
+
+        collection.insert_documents([Document(id=1, vector=[0.1, 0.2])])
+        self.client.get_collection("test_collection")
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_get_collections(self, mock_request):
+        # Shaped like the server's collectionStatsWithName.
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.json.return_value = [{
+            "name": "test_collection",
+            "document_count": 3,
+            "dimension_count": 2,
+            "quantization": 8,
+            "distance_method": "cosine"
+        }]
+        mock_request.return_value = mock_response
+
+        collections = self.client.get_collections()
+        self.assertEqual([c.collection_name for c in collections], ["test_collection"])
+        self.assertEqual(collections[0].distance_function, "cosine")
+        self.assertEqual(self.client.get_collection("test_collection").document_count, 3)
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('requests.Session.request')
+    def test_cached_results_are_copies(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.json.return_value = [1, 2, 3]
+        mock_request.return_value = mock_response
+
+        collection = Collection(self.client, "test_collection", 0, 2, 8, "cosine")
+        ids = collection.get_document_ids()
+        ids.remove(2)
+        self.assertEqual(collection.get_document_ids(), [1, 2, 3])
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_cache_is_thread_safe(self):
+        cache = ResponseCache(maxsize=16, ttl=60)
+        base = "http://x/api/v1/collections"
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(3000):
+                    url = f"{base}/c{i % 4}"
+                    cache.put(url, [i])
+                    cache.put(url + "/ids", [i])
+                    cache.get(url + "/ids")
+                    if i % 3 == n % 3:
+                        cache.invalidate(url)
+                    cache.discard(base)
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 16)
+
+    def test_insert_throughput(self):
+        # Stub out the transport, but still drain request bodies so that
+        # streamed uploads are encoded, and time the client-side work.
+        sent = []
+
+        def send(session, request, **kwargs):
+            body = request.body
+            if not isinstance(body, bytes):
+                body = b"".join(body)
+            sent.append(body)
+            response = requests.Response()
+            response.status_code = 201
+            response._content = b'{"ok":true}'
+            return response
+
+        collection = Collection(self.client, "test_collection", 0, 128, 8, "cosine")
+        vector = [0.1] * 128
+        documents = [Document(id=i, vector=vector, metadata={"key": "value"}) for i in range(10000)]
+
+        with patch.object(requests.Session, "send", send):
+            start = time.perf_counter()
+            collection.insert_documents(documents[:500])
+            collection.insert_documents(documents)
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual([len(orjson.loads(body)) for body in sent], [500, 10000])
+        self.assertLess(elapsed, 5.0)
+
+    def test_insert_non_string_metadata_keys(self):
+        collection = Collection(self.client, "test_collection", 0, 2, 8, "cosine")
+        documents = [Document(id=1, vector=[0.1, 0.2], metadata={1: "a"})]
+        with patch.object(requests.Session, "request") as mock_request:
+            mock_request.return_value = MagicMock(status_code=201)
+            collection.insert_documents(documents)
+            self.assertEqual(orjson.loads(mock_request.call_args.kwargs["data"])[0]["metadata"], {"1": "a"})
+
+            self.client.stream_threshold = 0
+            collection.insert_documents(documents)
+            body = b"".join(mock_request.call_args.kwargs["data"])
+            self.assertEqual(orjson.loads(body)[0]["metadata"], {"1": "a"})
 
     # Add more tests for other methods...
 
+class TestPackage(unittest.TestCase):
+    def test_exports(self):
+        import syzgy
+        from syzgy import client
+        self.assertIs(syzgy.SyzgyClient, client.SyzgyClient)
+        self.assertIs(syzgy.Collection, client.Collection)
+        for name in ("insert_documents", "search", "get_document_ids"):
+            self.assertTrue(hasattr(syzgy.Collection, name))
+
+class TestDocument(unittest.TestCase):
+    def test_binary_vector_encoding(self):
+        doc = Document(id=1, vector=[0.5, -1.0, 2.0])
+        d = doc.to_dict(binary=True)
+        self.assertNotIn("vector", d)
+        self.assertEqual(d["vector_encoding"], "f32b64")
+        self.assertEqual(list(array.array('f', base64.b64decode(d["vector_b64"]))), [0.5, -1.0, 2.0])
+
+        packed = Document(id=1, vector=array.array('f', [0.5, -1.0, 2.0]))
+        self.assertEqual(packed.to_dict()["vector"], [0.5, -1.0, 2.0])
+        self.assertEqual(packed.to_dict(binary=True)["vector_b64"], d["vector_b64"])
+
+        doc.vector_dtype = "int8"
+        d = doc.to_dict(binary=True)
+        self.assertEqual(d["vector_encoding"], "i8b64")
+        self.assertEqual(list(array.array('b', base64.b64decode(d["vector_b64"]))), [64, -127, 127])
+
 if __name__ == '__main__':
     unittest.main()
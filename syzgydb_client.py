@@ -1,10 +1,39 @@
 #!/usr/bin/env python3
 import csv
+import json
+import multiprocessing
+import os
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from syzgy.client import _iter_json_array
+
+TWEETS_CSV = "training.1600000.processed.noemoticon.csv"
 
 class SyzgyDBClient:
-    def __init__(self, server_address):
+    def __init__(self, server_address, stream_threshold=1000):
         self.server_address = server_address
+        # Batches larger than this are uploaded with a chunked body.
+        self.stream_threshold = stream_threshold
+        self._session = requests.Session()
+        self._session.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+        # raise_on_status=False hands the last response back once retries run
+        # out, so callers see the server's error rather than a RetryError.
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=64, max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self):
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def create_collection(self, name, vector_size, quantization, distance_function):
         url = f"{self.server_address}/api/v1/collections"
@@ -14,17 +43,17 @@ class SyzgyDBClient:
             "quantization": quantization,
             "distance_function": distance_function
         }
-        response = requests.post(url, json=data)
+        response = self._session.post(url, json=data)
         return response.json()
 
     def delete_collection(self, name):
         url = f"{self.server_address}/api/v1/collections/{name}"
-        response = requests.delete(url)
+        response = self._session.delete(url)
         return response.json()  
 
     def get_info(self, collection_name):
         url = f"{self.server_address}/api/v1/collections/{collection_name}"
-        response = requests.get(url)
+        response = self._session.get(url)
         return response.json()
 
     def insert_record(self, collection_name, record_id, text=None, vector=None, metadata=None):
@@ -35,18 +64,69 @@ class SyzgyDBClient:
             "vector": vector,
             "metadata": metadata or {}
         }
-        response = requests.post(url, json=data)
+        response = self._session.post(url, json=data)
         return response.json()
 
     def insert_records(self, collection_name, records):
         url = f"{self.server_address}/api/v1/collections/{collection_name}/records"
-        print("Send to ", url)
-        response = requests.post(url, json=records)
-        if response.status_code != 200:
-            print(f"HTTP Error: {response.status_code} - {response.text}")
-        return response.json()
+        # Small lists are encoded in one orjson call. Large lists and other
+        # iterables are streamed with a chunked body.
+        if isinstance(records, list) and len(records) <= self.stream_threshold:
+            payload = orjson.dumps(records, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = _iter_json_array(records)
+        response = self._session.post(url, data=payload, headers={"Content-Type": "application/json"})
+        # Only the status matters on success; the body is parsed solely to
+        # report an error.
+        if response.status_code >= 400:
+            try:
+                detail = response.json()
+            except ValueError:
+                detail = response.text
+            raise requests.HTTPError(f"HTTP {response.status_code} {response.reason}: {detail}", response=response)
+
+def loadProgress(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def saveProgress(path, offset, last_line, shard=None):
+    # Write to a temporary file and rename it over the old one, so a crash
+    # never leaves a half-written progress file behind. shard records the
+    # (start, end) byte range a parallel worker was given.
+    progress = {"offset": offset, "last_line": last_line}
+    if shard is not None:
+        progress["shard"] = list(shard)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(progress, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def iterBatches(csv_reader, batch_size, store_text=False, line_offset=0):
+    # Yield lists of up to batch_size tweet records without reading the
+    # whole file into memory.
+    #
+    # The server only uses "text" to compute the embedding, so by default
+    # the metadata carries just the sentiment label from the first column
+    # rather than a second copy of the tweet. Pass store_text=True to keep
+    # the tweet in metadata so it comes back in search results.
+    records = []
+    for row in csv_reader:
+        # Extract the tweet from the 6th column (index 5)
+        tweet_text = row[5]
+        metadata = {"text": tweet_text} if store_text else {"sentiment": row[0]}
+        records.append({"id": line_offset + csv_reader.line_num, "text": tweet_text, "metadata": metadata})
+        if len(records) == batch_size:
+            yield records
+            records = []
+    if records:
+        yield records
 
-def processTweets():
+def processTweets(batch_size=128, store_text=False, progress_path="progress.json", log_every=100):
     name = "tweets"
     #print("Creating collection...")
     #print(client.create_collection(name, 384, 8, "cosine"))
@@ -55,48 +135,172 @@ def processTweets():
     collection_info = client.get_info(name)
     document_count = collection_info.get("document_count", 0)
 
-
     # Read the csv file "training.1600000.processed.noemoticon.csv"
     # Collect all tweets from the 6th column in the collection
+    with open(TWEETS_CSV, mode='r', encoding='latin1') as file:
+        # Read through readline() rather than iterating the file directly,
+        # which would disable file.tell().
+        csv_reader = csv.reader(iter(file.readline, ""))
+
+        # Resume from the byte offset saved after the last inserted batch.
+        # If the collection holds fewer documents than the progress file
+        # claims, it was reset since, so fall back to skipping rows.
+        progress = loadProgress(progress_path)
+        if progress is not None and progress["last_line"] <= document_count:
+            print("Resuming after line {}".format(progress["last_line"]))
+            file.seek(progress["offset"])
+            line_offset = progress["last_line"]
+        else:
+            print("Skipping {} rows".format(document_count))
+            for _ in range(document_count):
+                next(csv_reader, None)
+            line_offset = 0
+
+        # Report progress every log_every batches; printing per batch would
+        # block the loop on stdout.
+        for batch_num, records in enumerate(iterBatches(csv_reader, batch_size, store_text, line_offset), 1):
+            client.insert_records(name, records)
+            saveProgress(progress_path, file.tell(), line_offset + csv_reader.line_num)
+            if batch_num % log_every == 0:
+                print(f"batches={batch_num} through line {line_offset + csv_reader.line_num}")
+
+def processTweetsPandas(batch_size=128, store_text=False, log_every=100):
+    # Same ingestion as processTweets, but parses the CSV with pandas' C
+    # reader and only materializes the sentiment and tweet columns.
+    # Resumes by document_count rather than a saved byte offset.
+    import pandas as pd
+
+    name = "tweets"
+    document_count = client.get_info(name).get("document_count", 0)
+    print("Skipping {} rows".format(document_count))
+
+    chunks = pd.read_csv(TWEETS_CSV, header=None, usecols=[0, 5], chunksize=batch_size, dtype=str,
+                         encoding="latin-1", skiprows=document_count, na_filter=False)
+    line = document_count
+    for batch_num, chunk in enumerate(chunks, 1):
+        records = []
+        for sentiment, tweet_text in zip(chunk[0], chunk[5]):
+            line += 1
+            metadata = {"text": tweet_text} if store_text else {"sentiment": sentiment}
+            records.append({"id": line, "text": tweet_text, "metadata": metadata})
+        client.insert_records(name, records)
+        if batch_num % log_every == 0:
+            print(f"batches={batch_num} through line {line}")
+
+def splitCsv(path, workers):
+    # Split the file into byte ranges aligned to line starts, and count the
+    # lines before each range so record ids match processTweets. Assumes no
+    # quoted field contains a newline, which holds for the tweets file.
+    size = os.path.getsize(path)
+    starts = [0]
+    with open(path, "rb") as f:
+        for i in range(1, workers):
+            f.seek(size * i // workers)
+            f.readline()
+            starts.append(max(f.tell(), starts[-1]))
+    ends = starts[1:] + [size]
+
+    shards = []
+    line_count = 0
+    with open(path, "rb") as f:
+        for start, end in zip(starts, ends):
+            shards.append((start, end, line_count))
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(1 << 20, remaining))
+                line_count += chunk.count(b"\n")
+                remaining -= len(chunk)
+    return shards
+
+def _iterLines(file, end):
+    while file.tell() < end:
+        line = file.readline()
+        if not line:
+            break
+        yield line.decode("latin1")
+
+def _ingestRange(args):
+    # Worker for processTweetsParallel: insert the rows of one byte range
+    # using a client (and so a connection pool) of its own.
+    server_address, name, start, end, line_offset, batch_size, store_text, progress_path = args
+
+    # Only resume from progress saved for this exact byte range. A file
+    # written with a different worker count (or file size) describes some
+    # other shard, so start the range over rather than skip its rows.
+    offset = start
+    progress = loadProgress(progress_path)
+    if progress is not None and progress.get("shard") == [start, end]:
+        offset, line_offset = progress["offset"], progress["last_line"]
+
+    with SyzgyDBClient(server_address) as worker_client, open(TWEETS_CSV, "rb") as file:
+        file.seek(offset)
+        csv_reader = csv.reader(_iterLines(file, end))
+        for records in iterBatches(csv_reader, batch_size, store_text, line_offset):
+            worker_client.insert_records(name, records)
+            saveProgress(progress_path, file.tell(), line_offset + csv_reader.line_num, (start, end))
+
+def processTweetsParallel(workers=None, batch_size=128, store_text=False, progress_path="progress.json"):
+    # Shard the CSV across worker processes so CSV parsing and JSON
+    # encoding are not bound to one core, and the server sees one
+    # connection per worker. Each shard keeps its own progress file.
+    name = "tweets"
+    workers = workers or os.cpu_count()
+
+    # Progress files from before the collection was emptied are stale.
+    if client.get_info(name).get("document_count", 0) == 0:
+        for i in range(workers):
+            if os.path.exists(f"{progress_path}.{i}"):
+                os.remove(f"{progress_path}.{i}")
+
+    tasks = [(client.server_address, name, start, end, line_offset, batch_size, store_text, f"{progress_path}.{i}")
+             for i, (start, end, line_offset) in enumerate(splitCsv(TWEETS_CSV, workers))]
+    with multiprocessing.Pool(workers) as pool:
+        pool.map(_ingestRange, tasks)
+
+def sweepBatchSizes(batch_sizes=(1, 8, 32, 128, 512), row_count=10000):
+    # Time inserting the same slice of tweets at each batch size into a
+    # scratch collection, to pick a batch_size for processTweets.
+    name = "tweets_sweep"
+    with open(TWEETS_CSV, mode='r', encoding='latin1') as file:
+        records = next(iterBatches(csv.reader(file), row_count), [])
+
+    for batch_size in batch_sizes:
+        client.delete_collection(name)
+        client.create_collection(name, 384, 8, "cosine")
+        start = time.perf_counter()
+        for i in range(0, len(records), batch_size):
+            client.insert_records(name, records[i:i + batch_size])
+        elapsed = time.perf_counter() - start
+        print(f"batch_size={batch_size}: {len(records) / elapsed:.1f} records/s ({elapsed:.2f} s)")
+
+    client.delete_collection(name)
+
+async def processTweetsAsync(batch_size=32, concurrency=2, store_text=False):
+    # Same ingestion as processTweets, but keeps several batch inserts in
+    # flight at once. Requires the syzgy package with its async extra.
+    from syzgy import Document
+    from syzgy.async_client import AsyncSyzgyClient, bulk_insert
+
+    name = "tweets"
+    async with AsyncSyzgyClient(client.server_address) as async_client:
+        collection = await async_client.get_collection(name)
+        document_count = collection.document_count
+
+        # Hand documents to bulk_insert in windows so the whole file is
+        # never held in memory.
+        window = batch_size * concurrency * 4
+        with open(TWEETS_CSV, mode='r', encoding='latin1') as file:
+            csv_reader = csv.reader(file)
+
+            print("Skipping {} rows".format(document_count))
+            for _ in range(document_count):
+                next(csv_reader, None)
+
+            for records in iterBatches(csv_reader, window, store_text):
+                documents = [Document(**record) for record in records]
+                await bulk_insert(collection, documents, batch_size, concurrency)
+
 
-    batch_size = 100
-    records = []
-    with open("training.1600000.processed.noemoticon.csv", mode='r', encoding='latin1') as file:
-        csv_reader = csv.reader(file)
-
-        print("Skipping {} rows".format(document_count))
-        
-        # Skip rows based on document_count
-        for _ in range(document_count):
-            next(csv_reader, None)
-
-        for row in csv_reader:
-            # Extract the tweet from the 6th column (index 5)
-            tweet_text = row[5]
-            
-            # Create a record for the tweet
-            record_id = csv_reader.line_num  # or any other unique identifier
-            record = {
-                "id": record_id,
-                "text": tweet_text,
-                "metadata": {"text": tweet_text}
-            }
-            records.append(record)
-
-            # Insert records in batches of 100
-            if len(records) == batch_size:
-                print(f"Inserting batch of {batch_size} records...")
-                response = client.insert_records(name, records)
-                print(response)
-                records = []  # Clear the batch
-
-    # Insert any remaining records
-    if records:
-        print(f"Inserting final batch of {len(records)} records...")
-        response = client.insert_records(name, records)
-        print(response)
-            
-            
 # Example usage
 if __name__ == "__main__":
     client = SyzgyDBClient("http://localhost:8080")